@@ -2,7 +2,7 @@ import json
 import os
 import tarfile
 import tempfile
-from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
 import boto3
 import pandas as pd
@@ -11,12 +11,38 @@ from featuretools.entityset.relationship import Relationship
 from featuretools.entityset.serialize import FORMATS
 from featuretools.utils.gen_utils import (
     check_schema_version,
-    use_s3fs_es,
-    use_smartopen_es
+    open_boto3_es,
+    open_s3fs_es,
+    open_smartopen_es
 )
 from featuretools.utils.wrangle import _is_s3, _is_url
 from featuretools.variable_types.variable import LatLong, find_variable_types
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+LATLONG_KERNELS = ['split_pattern', 'utf8_slice_codeunits', 'utf8_trim_whitespace', 'list_element']
+
+
+def _has_kernels(module, kernels):
+    return all(hasattr(module, kernel) for kernel in kernels)
+
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:
+    pa = None
+else:
+    # Older pyarrow releases ship pyarrow.compute without the string and list
+    # kernels used to parse LatLong columns, so fall back to pandas for them.
+    if not _has_kernels(pc, LATLONG_KERNELS):
+        pa = None
+
+TAR_BUFFER_SIZE = 1024 * 1024
+
 
 def description_to_variable(description, entity=None):
     '''Deserialize variable from variable description.
@@ -39,33 +65,56 @@ def description_to_variable(description, entity=None):
     return variable
 
 
-def description_to_entity(description, entityset, path=None):
+def description_to_entity(description, entityset, path=None, dataframe=None, columns=None, filters=None):
     '''Deserialize entity from entity description and add to entityset.
 
     Args:
         description (dict) : Description of :class:`.Entity`.
         entityset (EntitySet) : Instance of :class:`.EntitySet` to add :class:`.Entity`.
         path (str) : Root directory to serialized entityset.
+        dataframe (DataFrame) : Entity data that has already been read. If None, data is read from path.
+        columns (list[str]) : Variables to read from path. The index and time index are always read.
+            If None, all variables are read.
+        filters (list[tuple]) : Filters used to skip rows when reading parquet data from path.
     '''
-    if path:
-        dataframe = read_entity_data(description, path=path)
-    else:
-        dataframe = empty_dataframe(description)
-    variable_types = {variable['id']: description_to_variable(variable) for variable in description['variables']}
+    index = description.get('index')
+    time_index = description.get('time_index')
+    if columns is not None:
+        columns = [column for column in [index, time_index] if column and column not in columns] + list(columns)
+    if dataframe is None:
+        if path:
+            dataframe = read_entity_data(description, path=path, columns=columns, filters=filters)
+        else:
+            dataframe = empty_dataframe(description)
+            if columns is not None:
+                dataframe = dataframe[columns]
+
+    registry = find_variable_types()
+    unknown = registry.get('None')  # 'None' will return the Unknown variable type
+    variable_types = {variable['id']: registry.get(_type_string(variable), unknown)
+                      for variable in description['variables'] if variable['id'] in dataframe}
+    secondary_time_index = description['properties'].get('secondary_time_index')
+    if secondary_time_index:
+        secondary_time_index = {column: [variable for variable in variables if variable in dataframe]
+                                for column, variables in secondary_time_index.items() if column in dataframe}
     entityset.entity_from_dataframe(
         description['id'],
         dataframe,
-        index=description.get('index'),
-        time_index=description.get('time_index'),
-        secondary_time_index=description['properties'].get('secondary_time_index'),
-        variable_types=variable_types)
+        index=index,
+        time_index=time_index,
+        secondary_time_index=secondary_time_index,
+        variable_types=variable_types,
+        # Entity data is written in the order of the entity's dataframe,
+        # which was sorted by time index when the entity was created.
+        already_sorted=True)
 
 
-def description_to_entityset(description, **kwargs):
+def description_to_entityset(description, max_workers=None, **kwargs):
     '''Deserialize entityset from data description.
 
     Args:
         description (dict) : Description of an :class:`.EntitySet`. Likely generated using :meth:`.serialize.entityset_to_description`
+        max_workers (int) : Maximum number of threads used to read entity data in parallel. Defaults to the number of CPUs.
         kwargs (keywords): Additional keyword arguments to pass as keywords arguments to the underlying deserialization method.
 
     Returns:
@@ -78,11 +127,20 @@ def description_to_entityset(description, **kwargs):
     path = description.get('path')
     entityset = EntitySet(description['id'])
 
+    entities = list(description['entities'].values())
+
+    # If path is None, an empty dataframe will be created for each entity.
+    dataframes = [None] * len(entities)
+    if path and entities:
+        # Reading entity data is independent per entity, so overlap the reads.
+        # Entities are still added to the entityset serially below.
+        max_workers = min(len(entities), max_workers or os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            dataframes = list(executor.map(lambda entity: read_entity_data(entity, path=path, extra_params=kwargs), entities))
+
     last_time_index = []
-    for entity in description['entities'].values():
-        entity['loading_info']['params'].update(kwargs)
-        # If path is None, an empty dataframe will be created for entity.
-        description_to_entity(entity, entityset, path=path)
+    for entity, dataframe in zip(entities, dataframes):
+        description_to_entity(entity, entityset, path=path, dataframe=dataframe)
         if entity['properties']['last_time_index']:
             last_time_index.append(entity['id'])
 
@@ -107,54 +165,123 @@ def empty_dataframe(description):
     '''
     columns = [variable['id'] for variable in description['variables']]
     dtypes = description['loading_info']['properties']['dtypes']
-    return pd.DataFrame(columns=columns).astype(dtypes)
+    return pd.DataFrame({column: pd.Series(dtype=dtypes[column]) for column in columns}, columns=columns)
+
 
+def _cast_dtypes(dataframe, dtypes):
+    '''Cast dataframe columns to dtypes, skipping columns that already match.
 
-def read_entity_data(description, path):
+    Args:
+        dataframe (DataFrame) : Dataframe to cast.
+        dtypes (dict) : Mapping of column name to dtype.
+
+    Returns:
+        df (DataFrame) : Dataframe with columns of the requested dtypes.
+    '''
+    needs_cast = {column: dtype for column, dtype in dtypes.items() if str(dataframe[column].dtype) != str(dtype)}
+    if needs_cast:
+        dataframe = dataframe.astype(needs_cast, copy=False)
+    return dataframe
+
+
+def read_entity_data(description, path, extra_params=None, columns=None, filters=None):
     '''Read description data from disk.
 
     Args:
         description (dict) : Description of :class:`.Entity`.
         path (str): Location on disk to read entity data.
+        extra_params (dict) : Loading parameters that override those stored in the description.
+        columns (list[str]) : Columns to read. If None, all variables of the entity are read.
+        filters (list[tuple]) : Filters passed to :func:`pandas.read_parquet` to skip rows when reading.
+            Only supported for parquet data.
 
     Returns:
         df (DataFrame) : Instance of dataframe.
     '''
     file = os.path.join(path, description['loading_info']['location'])
-    kwargs = description['loading_info'].get('params', {})
+    kwargs = {**description['loading_info'].get('params', {}), **(extra_params or {})}
     load_format = description['loading_info']['type']
+    if load_format not in FORMATS:
+        error = 'must be one of the following formats: {}'
+        raise ValueError(error.format(', '.join(FORMATS)))
+    if filters is not None and load_format != 'parquet':
+        raise ValueError('filters are only supported for parquet entity data')
+
+    dtypes = description['loading_info']['properties']['dtypes']
+    if columns is not None:
+        dtypes = {column: dtype for column, dtype in dtypes.items() if column in columns}
+
     if load_format == 'csv':
+        # Parse columns directly into their stored dtypes. Datetimes are not
+        # accepted by `dtype` and have to be parsed through `parse_dates`.
+        # Categories and object columns are left to the parser's inference and
+        # the cast below, which keeps their values as ints, bools, etc.
+        # instead of turning them into strings.
+        parse_dates = [column for column, dtype in dtypes.items() if dtype.startswith('datetime64')]
+        parse_dtypes = {column: dtype for column, dtype in dtypes.items()
+                        if not dtype.startswith(('datetime64', 'timedelta64', 'category', 'object'))}
         dataframe = pd.read_csv(
             file,
             engine=kwargs['engine'],
             compression=kwargs['compression'],
             encoding=kwargs['encoding'],
+            usecols=columns,
+            dtype=parse_dtypes,
+            parse_dates=parse_dates,
         )
     elif load_format == 'parquet':
-        dataframe = pd.read_parquet(file, engine=kwargs['engine'])
-    elif load_format == 'pickle':
-        dataframe = pd.read_pickle(file, **kwargs)
+        # Only read the columns that belong to variables of the entity.
+        if columns is None:
+            columns = [variable['id'] for variable in description['variables']]
+        read_kwargs = {} if filters is None else {'filters': filters}
+        dataframe = pd.read_parquet(file, engine=kwargs['engine'], columns=columns, **read_kwargs)
     else:
-        error = 'must be one of the following formats: {}'
-        raise ValueError(error.format(', '.join(FORMATS)))
-    dtypes = description['loading_info']['properties']['dtypes']
-    dataframe = dataframe.astype(dtypes)
+        # Pickled dataframes carry their dtypes, so the cast below is
+        # skipped for every column that was restored as stored.
+        dataframe = pd.read_pickle(file, compression=kwargs.get('compression', 'infer'))
+        if columns is not None:
+            dataframe = dataframe[columns]
+    dataframe = _cast_dtypes(dataframe, dtypes)
 
     if load_format in ['parquet', 'csv']:
-        latlongs = []
-        for var_description in description['variables']:
-            if var_description['type']['value'] == LatLong.type_string:
-                latlongs.append(var_description["id"])
-
-        def parse_latlong(x):
-            return tuple(float(y) for y in x[1:-1].split(","))
-
+        latlongs = [variable['id'] for variable in description['variables']
+                    if _type_string(variable) == LatLong.type_string and variable['id'] in dataframe]
         for column in latlongs:
-            dataframe[column] = dataframe[column].apply(parse_latlong)
+            dataframe[column] = _parse_latlong(dataframe[column])
 
     return dataframe
 
 
+def _type_string(description):
+    type = description['type']
+    return type if isinstance(type, str) else type.get('value')
+
+
+def _parse_latlong(series):
+    # Strip the parentheses and split on the comma once for the
+    # whole column instead of parsing every value in Python.
+    if pa is not None:
+        parts = pc.split_pattern(pc.utf8_slice_codeunits(pa.array(series, type=pa.string()), 1, -1), ',')
+        lat, lon = [pc.cast(pc.utf8_trim_whitespace(pc.list_element(parts, i)), pa.float64())
+                    .to_numpy(zero_copy_only=False).tolist() for i in (0, 1)]
+    else:
+        values = series.str[1:-1].str.split(',')
+        lat = values.str[0].astype(float).tolist()
+        lon = values.str[1].astype(float).tolist()
+    return pd.Series(list(zip(lat, lon)), index=series.index, dtype=object)
+
+
+def _loads(data):
+    # Use orjson when it is installed. It does not accept the NaN and Infinity
+    # literals that `json.dump` writes, so fall back to `json` for those.
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data)
+
+
 def read_data_description(path):
     '''Read data description from disk, S3 path, or URL.
 
@@ -168,12 +295,58 @@ def read_data_description(path):
     path = os.path.abspath(path)
     assert os.path.exists(path), '"{}" does not exist'.format(path)
     file = os.path.join(path, 'data_description.json')
-    with open(file, 'r') as file:
-        description = json.load(file)
+    with open(file, 'rb') as file:
+        description = _loads(file.read())
     description['path'] = path
     return description
 
 
+def extract_archive(tar, path, max_workers=32):
+    '''Extract an entityset archive into a directory.
+
+    Files are read from the archive in order and written by a pool of threads.
+    Once `data_description.json` has been read, only the entity data files it
+    references are extracted. Directories are created once per path and
+    modification times are not restored.
+
+        Args:
+            tar (TarFile): Archive to extract. May be opened in streaming mode.
+            path (str): Directory to extract the archive into.
+            max_workers (int): Maximum number of threads used to write files.
+    '''
+    root = os.path.abspath(path)
+    directories = {root}
+    needed = None
+
+    def makedirs(directory):
+        if directory not in directories:
+            os.makedirs(directory, exist_ok=True)
+            directories.add(directory)
+
+    def write(file, data):
+        with open(file, 'wb') as f:
+            f.write(data)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = []
+        for member in tar:
+            target = os.path.normpath(os.path.join(root, member.name.lstrip('/')))
+            if os.path.commonpath([root, target]) != root:
+                raise ValueError('"{}" is outside of the extraction directory'.format(member.name))
+            name = os.path.relpath(target, root)
+            if member.isdir():
+                makedirs(target)
+            elif member.isfile() and (needed is None or name in needed):
+                makedirs(os.path.dirname(target))
+                data = tar.extractfile(member).read()
+                if name == 'data_description.json':
+                    entities = _loads(data)['entities'].values()
+                    needed = {os.path.normpath(entity['loading_info']['location']) for entity in entities}
+                futures.append(executor.submit(write, target, data))
+        for future in futures:
+            future.result()
+
+
 def read_entityset(path, profile_name=None, **kwargs):
     '''Read entityset from disk, S3 path, or URL.
 
@@ -185,25 +358,25 @@ def read_entityset(path, profile_name=None, **kwargs):
     '''
     if _is_url(path) or _is_s3(path):
         with tempfile.TemporaryDirectory() as tmpdir:
-            file_name = Path(path).name
-            file_path = os.path.join(tmpdir, file_name)
-            transport_params = {}
-            session = boto3.Session()
-
+            # Only look up AWS credentials when reading from S3 without a profile,
+            # since resolving them can be slow on machines outside of AWS.
             if _is_url(path):
-                use_smartopen_es(file_path, path)
+                fin = open_smartopen_es(path)
             elif isinstance(profile_name, str):
-                transport_params = {'session': boto3.Session(profile_name=profile_name)}
-                use_smartopen_es(file_path, path, transport_params)
+                fin = open_boto3_es(path, boto3.Session(profile_name=profile_name))
             elif profile_name is False:
-                use_s3fs_es(file_path, path)
-            elif session.get_credentials() is not None:
-                use_smartopen_es(file_path, path)
+                fin = open_s3fs_es(path)
             else:
-                use_s3fs_es(file_path, path)
-
-            with tarfile.open(str(file_path)) as tar:
-                tar.extractall(path=tmpdir)
+                session = boto3.Session()
+                if session.get_credentials() is not None:
+                    fin = open_boto3_es(path, session)
+                else:
+                    fin = open_s3fs_es(path)
+
+            # Extract the archive while it is being downloaded, rather than
+            # writing it to a local file first.
+            with fin, tarfile.open(fileobj=fin, mode='r|*', bufsize=TAR_BUFFER_SIZE) as tar:
+                extract_archive(tar, tmpdir)
 
             data_description = read_data_description(tmpdir)
             return description_to_entityset(data_description, **kwargs)
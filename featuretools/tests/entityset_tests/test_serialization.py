@@ -1,10 +1,14 @@
+import io
 import json
 import os
 import shutil
+import tarfile
 
 import boto3
+import numpy as np
 import pandas as pd
 import pytest
+from botocore.exceptions import ClientError
 
 from featuretools.demo import load_mock_customer
 from featuretools.entityset import EntitySet, deserialize, serialize
@@ -80,6 +84,14 @@ def test_entity_descriptions(es):
         assert entity.__eq__(_entity, deep=True)
 
 
+def test_entity_descriptions_not_modified(es):
+    _es = EntitySet(es.id)
+    for entity in es.metadata.entities:
+        description = serialize.entity_to_description(entity)
+        deserialize.description_to_entity(description, _es)
+        assert description == serialize.entity_to_description(entity)
+
+
 def test_entityset_description(es):
     description = serialize.entityset_to_description(es)
     _es = deserialize.description_to_entityset(description)
@@ -109,6 +121,8 @@ def test_empty_dataframe(es):
         description = serialize.entity_to_description(entity)
         dataframe = deserialize.empty_dataframe(description)
         assert dataframe.empty
+        dtypes = dataframe.dtypes.astype(str).to_dict()
+        assert dtypes == description['loading_info']['properties']['dtypes']
 
 
 def test_to_csv(es, path_management):
@@ -119,6 +133,58 @@ def test_to_csv(es, path_management):
     assert type(new_es['log'].df['latlong'][0]) == tuple
 
 
+def test_read_entity_data_type_strings(es, path_management):
+    es.to_csv(path_management, encoding='utf-8', engine='python')
+    description = deserialize.read_data_description(path_management)['entities']['log']
+    for variable in description['variables']:
+        variable['type'] = variable['type']['value']
+    dataframe = deserialize.read_entity_data(description, path=path_management)
+    assert type(dataframe['latlong'][0]) == tuple
+
+
+@pytest.mark.parametrize("pyarrow", [True, False])
+def test_parse_latlong(pyarrow, monkeypatch):
+    if not pyarrow:
+        monkeypatch.setattr(deserialize, 'pa', None)
+    elif deserialize.pa is None:
+        pytest.skip('pyarrow is not installed')
+    series = pd.Series(['(1.5, -2.25)', '(3,4)', '(nan, nan)'], index=[2, 3, 4])
+    latlongs = deserialize._parse_latlong(series)
+    assert latlongs.index.equals(series.index)
+    assert latlongs[2] == (1.5, -2.25)
+    assert latlongs[3] == (3.0, 4.0)
+    assert pd.isnull(list(latlongs[4])).all()
+
+
+def test_to_csv_object_values(path_management):
+    df = pd.DataFrame({
+        'id': [0, 1, 2],
+        'ints': pd.Series([1, 2, 3], dtype=object),
+        'bools': [True, False, np.nan],
+    })
+    es = EntitySet('test')
+    es.entity_from_dataframe('entity', df, index='id',
+                             variable_types={'ints': Categorical, 'bools': Categorical})
+    es.to_csv(path_management, encoding='utf-8', engine='python')
+    new_es = deserialize.read_entityset(path_management)
+    new_df = new_es['entity'].df
+    assert new_df['ints'].tolist() == [1, 2, 3]
+    assert all(isinstance(value, int) for value in new_df['ints'])
+    assert new_df['bools'].tolist()[:2] == [True, False]
+    assert all(isinstance(value, bool) for value in new_df['bools'].tolist()[:2])
+    assert pd.isnull(new_df['bools'].iloc[2])
+
+
+def test_latlong_kernels():
+    class OldCompute:
+        split_pattern = None
+        utf8_trim_whitespace = None
+
+    assert not deserialize._has_kernels(OldCompute, deserialize.LATLONG_KERNELS)
+    if deserialize.pa is not None:
+        assert deserialize._has_kernels(deserialize.pc, deserialize.LATLONG_KERNELS)
+
+
 def test_to_pickle(es, path_management):
     es.to_pickle(path_management)
     new_es = deserialize.read_entityset(path_management)
@@ -127,6 +193,12 @@ def test_to_pickle(es, path_management):
     assert type(new_es['log'].df['latlong'][0]) == tuple
 
 
+def test_to_pickle_compression(es, path_management):
+    es.to_pickle(path_management, compression='gzip')
+    new_es = deserialize.read_entityset(path_management)
+    assert es.__eq__(new_es, deep=True)
+
+
 def test_to_parquet(es, path_management):
     es.to_parquet(path_management)
     new_es = deserialize.read_entityset(path_management)
@@ -135,6 +207,17 @@ def test_to_parquet(es, path_management):
     assert type(new_es['log'].df['latlong'][0]) == tuple
 
 
+def test_to_parquet_extra_columns(es, path_management):
+    es.to_parquet(path_management)
+    file = os.path.join(path_management, 'data', 'customers.parquet')
+    df = pd.read_parquet(file)
+    df['extra'] = 0
+    df.to_parquet(file)
+    new_es = deserialize.read_entityset(path_management)
+    assert 'extra' not in new_es['customers'].df.columns
+    assert es.__eq__(new_es, deep=True)
+
+
 def test_to_parquet_with_lti(path_management):
     es = load_mock_customer(return_entityset=True, random_seed=0)
     es.to_parquet(path_management)
@@ -142,6 +225,62 @@ def test_to_parquet_with_lti(path_management):
     assert es.__eq__(new_es, deep=True)
 
 
+def test_read_entityset_serial(es, path_management):
+    es.to_pickle(path_management)
+    new_es = deserialize.read_entityset(path_management, max_workers=1)
+    assert es.__eq__(new_es, deep=True)
+
+
+def test_read_entityset_params_not_modified(es, path_management):
+    es.to_csv(path_management, encoding='utf-8', engine='python')
+    description = deserialize.read_data_description(path_management)
+    params = {entity_id: dict(entity['loading_info']['params']) for entity_id, entity in description['entities'].items()}
+    new_es = deserialize.description_to_entityset(description, engine='c')
+    assert es.__eq__(new_es, deep=True)
+    for entity_id, entity in description['entities'].items():
+        assert entity['loading_info']['params'] == params[entity_id]
+
+
+@pytest.mark.parametrize("format", ['csv', 'pickle', 'parquet'])
+def test_description_to_entity_columns(es, path_management, format):
+    getattr(es, 'to_' + format)(path_management)
+    description = deserialize.read_data_description(path_management)['entities']['log']
+    _es = EntitySet(es.id)
+    deserialize.description_to_entity(description, _es, path=path_management, columns=['value', 'latlong'])
+    assert set(_es['log'].df.columns) == {'id', 'datetime', 'value', 'latlong'}
+    assert set(_es['log'].variable_types) == {'id', 'datetime', 'value', 'latlong'}
+    assert type(_es['log'].df['latlong'][0]) == tuple
+    pd.testing.assert_series_equal(_es['log'].df['value'], es['log'].df['value'])
+
+
+def test_read_entity_data_filters(es, path_management):
+    es.to_parquet(path_management)
+    description = deserialize.read_data_description(path_management)['entities']['log']
+    dataframe = deserialize.read_entity_data(description, path=path_management,
+                                             columns=['id', 'value'], filters=[('value', '>', 10)])
+    assert list(dataframe.columns) == ['id', 'value']
+    assert (dataframe['value'] > 10).all()
+    assert len(dataframe) == (es['log'].df['value'] > 10).sum()
+
+
+def test_read_entity_data_filters_csv(es, path_management):
+    es.to_csv(path_management)
+    description = deserialize.read_data_description(path_management)['entities']['log']
+    error_text = 'filters are only supported for parquet entity data'
+    with pytest.raises(ValueError, match=error_text):
+        deserialize.read_entity_data(description, path=path_management, filters=[('value', '>', 10)])
+
+
+@pytest.mark.parametrize("format", ['csv', 'pickle', 'parquet'])
+def test_deserialize_keeps_row_order(format, path_management):
+    df = pd.DataFrame({'id': [0, 1, 2], 'time': pd.to_datetime(['2019-01-03', '2019-01-01', '2019-01-02'])})
+    es = EntitySet('test')
+    es.entity_from_dataframe('entity', df, index='id', time_index='time', already_sorted=True)
+    getattr(es, 'to_' + format)(path_management)
+    new_es = deserialize.read_entityset(path_management)
+    assert list(new_es['entity'].df['id']) == [0, 1, 2]
+
+
 def test_to_pickle_id_none(path_management):
     es = EntitySet()
     es.to_pickle(path_management)
@@ -214,6 +353,11 @@ def test_serialize_s3_anon_parquet(es, s3_client, s3_bucket):
     assert es.__eq__(new_es, deep=True)
 
 
+def test_deserialize_s3_missing_key(s3_client, s3_bucket):
+    with pytest.raises(ClientError):
+        deserialize.read_entityset(TEST_S3_URL)
+
+
 def create_test_credentials(test_path):
     with open(test_path, "w+") as f:
         f.write("[test]\n")
@@ -275,6 +419,68 @@ def test_serialize_subdirs_not_removed(es, tmpdir):
         assert '__SAMPLE_TEXT__' not in json.load(f)
 
 
+def test_extract_archive(es, tmpdir):
+    write_path = str(tmpdir.mkdir("write"))
+    os.makedirs(os.path.join(write_path, 'data'))
+    serialize.dump_data_description(es, write_path, format='pickle')
+    file_path = serialize.create_archive(write_path)
+    read_path = str(tmpdir.mkdir("read"))
+    with tarfile.open(file_path, mode='r|*') as tar:
+        deserialize.extract_archive(tar, read_path)
+    new_es = deserialize.read_entityset(read_path)
+    assert es.__eq__(new_es, deep=True)
+
+
+def test_extract_archive_needed_files(es, tmpdir):
+    write_path = str(tmpdir.mkdir("write"))
+    os.makedirs(os.path.join(write_path, 'data'))
+    serialize.dump_data_description(es, write_path, format='pickle')
+    with open(os.path.join(write_path, 'data', 'README'), 'w') as f:
+        f.write('__SAMPLE_TEXT__')
+    file_path = serialize.create_archive(write_path)
+    read_path = str(tmpdir.mkdir("read"))
+    with tarfile.open(file_path, mode='r|*') as tar:
+        deserialize.extract_archive(tar, read_path)
+    assert not os.path.exists(os.path.join(read_path, 'data', 'README'))
+    new_es = deserialize.read_entityset(read_path)
+    assert es.__eq__(new_es, deep=True)
+
+
+def test_extract_archive_outside_path(tmpdir):
+    file_path = str(tmpdir.join('archive.tar'))
+    with tarfile.open(file_path, 'w') as tar:
+        info = tarfile.TarInfo('../outside.txt')
+        tar.addfile(info, io.BytesIO())
+    error_text = 'is outside of the extraction directory'
+    with tarfile.open(file_path) as tar:
+        with pytest.raises(ValueError, match=error_text):
+            deserialize.extract_archive(tar, str(tmpdir.mkdir("read")))
+    assert not os.path.exists(str(tmpdir.join('outside.txt')))
+
+
+def test_read_data_description_nan(tmpdir):
+    with open(str(tmpdir.join('data_description.json')), 'w') as f:
+        json.dump({'id': float('nan')}, f)
+    description = deserialize.read_data_description(str(tmpdir))
+    assert pd.isnull(description['id'])
+    assert description['path'] == str(tmpdir)
+
+
+def test_deserialize_url_skips_credentials(es, tmpdir, monkeypatch):
+    write_path = str(tmpdir.mkdir("write"))
+    os.makedirs(os.path.join(write_path, 'data'))
+    serialize.dump_data_description(es, write_path, format='pickle')
+    file_path = serialize.create_archive(write_path)
+
+    def session(*args, **kwargs):
+        raise AssertionError('boto3 session should not be created for URLs')
+
+    monkeypatch.setattr(deserialize.boto3, 'Session', session)
+    monkeypatch.setattr(deserialize, 'open_smartopen_es', lambda path: open(file_path, 'rb'))
+    new_es = deserialize.read_entityset(URL)
+    assert es.__eq__(new_es, deep=True)
+
+
 def test_deserialize_url_csv(es):
     new_es = deserialize.read_entityset(URL)
     assert es.__eq__(new_es, deep=True)
@@ -1,13 +1,24 @@
 import json
+import os
 import shutil
 import sys
+import threading
 import warnings
 from itertools import zip_longest
 
+import boto3
 import s3fs
+from boto3.s3.transfer import TransferConfig
 from smart_open import open
 from tqdm import tqdm
 
+S3_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=16 * 1024 * 1024,
+    max_concurrency=16,
+    use_threads=True,
+)
+
 
 def session_type():
     if 'IPython' not in sys.modules:
@@ -135,6 +146,62 @@ def use_smartopen_features(path, features_dict=None, transport_params=None, read
             json.dump(features_dict, f)
 
 
+def open_smartopen_es(path, transport_params=None):
+    return open(path, 'rb', transport_params=transport_params)
+
+
+def open_s3fs_es(path):
+    s3 = s3fs.S3FileSystem(anon=True)
+    return s3.open(path, 'rb')
+
+
+def open_boto3_es(path, session=None):
+    # Download with concurrent ranged requests from a background thread and
+    # hand the bytes to the caller, in order, through a pipe.
+    bucket, key = path.split('s3://', 1)[1].split('/', 1)
+    client = (session or boto3.Session()).client('s3')
+    read_fd, write_fd = os.pipe()
+    errors = []
+
+    def download():
+        try:
+            with os.fdopen(write_fd, 'wb') as fout:
+                client.download_fileobj(bucket, key, fout, Config=S3_TRANSFER_CONFIG)
+        except Exception as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=download, daemon=True)
+    thread.start()
+    return _DownloadStream(os.fdopen(read_fd, 'rb'), thread, errors)
+
+
+class _DownloadStream(object):
+    def __init__(self, fin, thread, errors):
+        self.fin = fin
+        self.thread = thread
+        self.errors = errors
+
+    def read(self, size=-1):
+        data = self.fin.read(size)
+        if not data and size != 0:
+            # The download has finished or failed. Surface its error
+            # instead of letting the caller treat the data as truncated.
+            self.thread.join()
+            if self.errors:
+                raise self.errors[0]
+        return data
+
+    def close(self):
+        self.fin.close()
+        self.thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
 def use_s3fs_features(file_path, features_dict=None, read=True):
     s3 = s3fs.S3FileSystem(anon=True)
     if read: